@@ -1,11 +1,30 @@
 import dash_bootstrap_components as dbc
-from dash import html, Output, Input, callback, State, dcc
+from dash import (
+    html,
+    Output,
+    Input,
+    callback,
+    clientside_callback,
+    ClientsideFunction,
+    State,
+    dcc,
+)
 import dash
 import dash_ag_grid as dag
-import ocha_stratus as stratus
-from datetime import datetime, timedelta
+import logging
+import coloredlogs
+from datetime import datetime
+
+from src.api import register_api
+from src.config import CLIENTSIDE_FILTERING, LOG_LEVEL
+from src.metrics import register_metrics
+from src.datasources import summary
+from src.utils import format_utils
 
 
+logger = logging.getLogger(__name__)
+coloredlogs.install(level=LOG_LEVEL, logger=logger)
+
 NAVBAR_HEIGHT = 60
 GUTTER = 15
 
@@ -17,6 +36,8 @@ app = dash.Dash(
 )
 server = app.server
 app.title = "IPC Data Pipeline"
+register_api(server)
+register_metrics(app)
 
 
 def disclaimer_modal():
@@ -68,7 +89,7 @@ def disclaimer_modal():
     )
 
 
-def ag_grid():
+def ag_grid(no_rows_message=None):
     dataTypeDefinitions = {
         "percentage": {
             "extendsDataType": "number",
@@ -78,6 +99,9 @@ def ag_grid():
             },
         }
     }
+    dashGridOptions = {"dataTypeDefinitions": dataTypeDefinitions}
+    if no_rows_message:
+        dashGridOptions["overlayNoRowsTemplate"] = no_rows_message
     return dag.AgGrid(
         id="data-grid",
         style={
@@ -85,7 +109,16 @@ def ag_grid():
             "margin": "15px",
             "width": f"calc(100vw - {GUTTER * 2}px)",
         },
-        dashGridOptions={"dataTypeDefinitions": dataTypeDefinitions},
+        dashGridOptions=dashGridOptions,
+        # Rows that changed in the latest update are flagged by `load_data`
+        getRowStyle={
+            "styleConditions": [
+                {
+                    "condition": "params.data && params.data._changed",
+                    "style": {"backgroundColor": "#fff4d6"},
+                },
+            ]
+        },
     )
 
 
@@ -99,7 +132,8 @@ def sidebar_controls():
                     This application displays processed IPC data for use by CERF  to identify year-on-year changes
                     in food security across countries. See
                     [here](https://docs.google.com/document/d/15o6f5yPIl3p3sj7NNw2MoHg6f7DHzwtCPfKRlfU2PJE/edit?tab=t.0#heading=h.ieffsjdjd8lt)
-                    for an overview of the methods and description of each column. Data is updated **daily**.
+                    for an overview of the methods and description of each column. Data is updated **daily**,
+                    and rows highlighted in yellow changed in the latest update.
                     """,
                         style={"marginBottom": "7px"},
                     )
@@ -219,17 +253,35 @@ def navbar(title):
     )
 
 
-layout = [
-    navbar(title="IPC Data Pipeline"),
-    disclaimer_modal(),
-    html.Div(
-        [sidebar_controls(), ag_grid()],
-        style={"display": "flex", "flexDirection": "row"},
-    ),
-]
+def page_layout(no_rows_message=None):
+    return [
+        navbar(title="IPC Data Pipeline"),
+        disclaimer_modal(),
+        html.Div(
+            [sidebar_controls(), ag_grid(no_rows_message)],
+            style={"display": "flex", "flexDirection": "row"},
+        ),
+    ]
+
+
+layout = page_layout()
+
 
+def serve_layout():
+    if CLIENTSIDE_FILTERING:
+        store = summary_store()
+        if store is None:
+            # The clientside callback shows an empty grid, so say why
+            page = page_layout(
+                "The summary could not be loaded, please try again later"
+            )
+        else:
+            page = layout
+        return html.Div(page + [dcc.Store(id="summary-store", data=store)])
+    return html.Div(layout)
 
-app.layout = html.Div(layout)
+
+app.layout = serve_layout
 
 
 @app.callback(
@@ -265,27 +317,37 @@ def export_data_as_csv(n_clicks, severity):
     prevent_initial_call=True,
 )
 def download_hunger_period_reference(n_clicks):
-    df = stratus.load_csv_from_blob(
-        "ds-ufe-food-security/processed/reference_periods/cleaned_reference_periods.csv"
-    )
+    df, _ = summary.load_reference_periods()
     if n_clicks:
         return dcc.send_data_frame(df.to_csv, "reference_hunger_periods.csv")
     return dash.no_update
 
 
-@callback(
-    Output("data-grid", "rowData"),
-    Output("data-grid", "columnDefs"),
-    Input("severity-dropdown", "value"),
-)
-def load_data(severity):
-    yesterday = datetime.now() - timedelta(days=1)
-    yesterday_formatted = yesterday.strftime("%Y-%m-%d")
-    df = stratus.load_csv_from_blob(
-        f"ds-ufe-food-security/processed/ipc_updates/annualized_ipc_summary_{severity}_{yesterday_formatted}.csv"
-    )
+def changed_rows():
+    """
+    Keys of the rows added or modified in the latest update, as
+    "Country|Phase" strings. Empty if no delta has been published or it can't
+    be read, as highlighting mustn't stop the summary from showing.
+    """
+    try:
+        df_delta, _ = summary.load_delta()
+        df_delta = df_delta[df_delta["Change Type"] != "removed"]
+        return set(
+            df_delta["Country"].astype(str) + "|" + df_delta["Phase"].astype(str)
+        )
+    except FileNotFoundError:
+        logger.debug("No delta published for the latest run, not highlighting rows")
+    except Exception:
+        logger.exception("Delta could not be loaded, not highlighting rows")
+    return set()
+
 
-    column_defs = [{"field": i} for i in df.columns]
+def style_column_defs(columns):
+    """
+    AG Grid column definitions for the summary columns, with formatting and
+    conditional styling based on the column name.
+    """
+    column_defs = [{"field": i} for i in columns if i != "_changed"]
     styled_column_defs = []
     for col_def in column_defs:
         if "Percentage" in col_def["field"]:
@@ -323,7 +385,55 @@ def load_data(severity):
             col_def["valueFormatter"] = {"function": "d3.format(',.0f')(params.value)"}
 
         styled_column_defs.append(col_def)
-    return df.to_dict("records"), styled_column_defs
+    return styled_column_defs
+
+
+def load_data(severity):
+    df, _ = summary.load_summary(severity)
+
+    changed = changed_rows()
+    records = df.to_dict("records")
+    for record in records:
+        record["_changed"] = f"{record['Country']}|{record['Phase']}" in changed
+    return records, style_column_defs(df.columns)
+
+
+def summary_store():
+    """
+    Combined summary for all severities, encoded for filtering in the browser.
+    Returns None if it can't be loaded, in which case the grid is left empty
+    with an error message.
+    """
+    try:
+        df, _ = summary.load_summary("all")
+    except Exception:
+        logger.exception("Combined summary could not be loaded for the browser")
+        return None
+    keys = df["Country"].astype(str) + "|" + df["Phase"].astype(str)
+    return {
+        "columnDefs": style_column_defs(df.columns),
+        "data": format_utils.encode_columnar(
+            df.assign(_changed=keys.isin(changed_rows()))
+        ),
+    }
+
+
+if CLIENTSIDE_FILTERING:
+    # Ship the combined summary once per page load and switch severity in the
+    # browser, see `assets/clientside.js`
+    clientside_callback(
+        ClientsideFunction(namespace="ipc", function_name="filterSummary"),
+        Output("data-grid", "rowData"),
+        Output("data-grid", "columnDefs"),
+        Input("severity-dropdown", "value"),
+        Input("summary-store", "data"),
+    )
+else:
+    callback(
+        Output("data-grid", "rowData"),
+        Output("data-grid", "columnDefs"),
+        Input("severity-dropdown", "value"),
+    )(load_data)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,45 @@
+// Clientside callbacks, used when the app runs with CLIENTSIDE_FILTERING=true
+
+(function () {
+    // Decoded rows, kept for the session so that only the first severity
+    // change pays for decompression
+    let decoded = { source: null, rows: [] };
+
+    async function decodeColumnar(encoded) {
+        const bytes = Uint8Array.from(atob(encoded), (c) => c.charCodeAt(0));
+        const stream = new Blob([bytes])
+            .stream()
+            .pipeThrough(new DecompressionStream("gzip"));
+        const table = JSON.parse(await new Response(stream).text());
+        const nRows = table.values.length ? table.values[0].length : 0;
+        const rows = new Array(nRows);
+        for (let i = 0; i < nRows; i++) {
+            const row = {};
+            table.columns.forEach((col, j) => {
+                row[col] = table.values[j][i];
+            });
+            rows[i] = row;
+        }
+        return rows;
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        ipc: {
+            filterSummary: async function (severity, store) {
+                if (!store || !store.data) {
+                    // The summary couldn't be loaded on the server, show the
+                    // grid's "no rows" overlay, which carries the error
+                    return [[], []];
+                }
+                if (decoded.source !== store.data) {
+                    decoded = { source: store.data, rows: await decodeColumnar(store.data) };
+                }
+                const rows =
+                    severity === "all"
+                        ? decoded.rows
+                        : decoded.rows.filter((row) => String(row.Phase) === severity);
+                return [rows, store.columnDefs];
+            },
+        },
+    });
+})();
@@ -0,0 +1,210 @@
+import argparse
+import json
+import os
+import pickle
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+BACKENDS = ["pandas", "polars"]
+SEVERITIES = ["3", "3+", "4", "4+", "5"]
+PERIODS = [
+    (1, 3, "current"),
+    (2, 5, "first_projection"),
+    (6, 9, "second_projection"),
+    (10, 1, "current"),
+]
+MONTHS = ["January", "February", "March", "April", "May", "June", "July"]
+
+
+def synthetic_ipc(n_countries: int, seed: int = 0) -> pd.DataFrame:
+    """
+    IPC data shaped like the output of `ipc.get_all_ipc()`, with three years of
+    current and projected analyses for each country.
+    """
+    rng = np.random.default_rng(seed)
+    now = datetime.now()
+    rows = []
+    for i in range(n_countries):
+        iso3 = f"C{i:04d}"
+        for year in [now.year - 3, now.year - 2, now.year - 1, now.year]:
+            for start_month, end_month, ipc_type in PERIODS:
+                start = pd.Timestamp(year=year, month=start_month, day=1)
+                end_year = year + (1 if end_month < start_month else 0)
+                end = pd.Timestamp(year=end_year, month=end_month, day=28)
+                for phase in ["1", "2", "3", "4", "5", "3+"]:
+                    rows.append(
+                        {
+                            "location_code": iso3,
+                            "ipc_phase": phase,
+                            "ipc_type": ipc_type,
+                            "population_in_phase": int(rng.integers(1e3, 1e7)),
+                            "population_fraction_in_phase": float(rng.random()),
+                            "From": start,
+                            "To": end,
+                            "year": end.year,
+                        }
+                    )
+    df = pd.DataFrame(rows)
+    df["year"] = df["year"].astype("int32")
+    return df
+
+
+def synthetic_periods(n_countries: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Reference periods shaped like `cleaned_reference_periods.csv`.
+    """
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(n_countries):
+        row = {"location_code": f"C{i:04d}"}
+        for col in ["data_driven_period", "expert_period_1", "expert_period_2"]:
+            if rng.random() < 0.2:
+                row[col] = np.nan
+            else:
+                months = rng.choice(MONTHS, size=rng.integers(1, 5), replace=False)
+                row[col] = ", ".join(months)
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def run_steps(df: pd.DataFrame, df_periods: pd.DataFrame) -> dict:
+    """
+    Run the processing steps of the pipeline, using whichever backend
+    COMPUTE_BACKEND selects.
+    """
+    from src.datasources import ipc
+    from src.utils import date_utils
+
+    ref_year = datetime.now().year
+    years = [ref_year, ref_year - 1, ref_year - 2]
+    results = {}
+    df = ipc.combine_4_plus(df)
+    results["combine_4_plus"] = df
+    df_peak = ipc.identify_peak_hunger_period(df, ref_year, "3+")
+    results["identify_peak_hunger_period"] = df_peak
+    for col in ["data_driven_period", "expert_period_1", "expert_period_2"]:
+        df_peak = date_utils.apply_overlap(df_peak, df_periods, col, f"{col}_overlap")
+    results["apply_overlap"] = df_peak
+    for severity in SEVERITIES:
+        for year in years:
+            results[f"match_peak_hunger_period_{severity}_{year}"] = (
+                ipc.match_peak_hunger_period(df, df_peak, year, severity)
+            )
+    return results
+
+
+def worker(n_countries: int, repeats: int, output: str):
+    warnings.simplefilter("ignore", pd.errors.SettingWithCopyWarning)
+    import src.datasources.ipc  # noqa: F401 - load both backends before measuring
+
+    df = synthetic_ipc(n_countries)
+    df_periods = synthetic_periods(n_countries)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # The first run warms up caches, and its results are compared for parity
+    results = run_steps(df, df_periods)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run_steps(df, df_periods)
+        timings.append(time.perf_counter() - start)
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with open(output, "wb") as f:
+        pickle.dump(
+            {
+                "results": results,
+                "rows": len(df),
+                "seconds": min(timings),
+                # Growth of the peak resident set while processing. ru_maxrss
+                # is in KB on Linux
+                "peak_rss_increase_mb": (rss_after - rss_before) / 1024,
+            },
+            f,
+        )
+
+
+def check_parity(expected: dict, actual: dict):
+    """
+    Assert that both backends give the same results, ignoring the index.
+    """
+    assert expected.keys() == actual.keys()
+    for name in expected:
+        df_expected = expected[name].reset_index(drop=True)
+        df_actual = actual[name].reset_index(drop=True)
+        if name == "combine_4_plus":
+            # Row order within the combined rows isn't meaningful
+            df_expected = df_expected.sort_values(list(df_expected.columns))
+            df_actual = df_actual.sort_values(list(df_actual.columns))
+            df_expected = df_expected.reset_index(drop=True)
+            df_actual = df_actual.reset_index(drop=True)
+        try:
+            pd.testing.assert_frame_equal(df_expected, df_actual, check_exact=False)
+        except AssertionError as e:
+            raise AssertionError(f"Backends differ in {name}: {e}") from e
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check parity and compare throughput and memory of the "
+        "pandas and polars compute backends on synthetic IPC data."
+    )
+    parser.add_argument("--countries", type=int, nargs="+", default=[50, 500, 2000])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--worker", choices=BACKENDS, help=argparse.SUPPRESS)
+    parser.add_argument("--output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.countries[0], args.repeats, args.output)
+        return
+
+    print(
+        f"{'countries':>9} {'rows':>9} {'backend':>8} {'seconds':>8} "
+        f"{'rows/s':>10} {'peak +MB':>9}"
+    )
+    for n_countries in args.countries:
+        runs = {}
+        for backend in BACKENDS:
+            # Each backend runs in a fresh process so peak memory is comparable
+            with tempfile.NamedTemporaryFile(suffix=".pkl", delete=False) as f:
+                output = f.name
+            subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "--worker",
+                    backend,
+                    "--countries",
+                    str(n_countries),
+                    "--repeats",
+                    str(args.repeats),
+                    "--output",
+                    output,
+                ],
+                env={**os.environ, "COMPUTE_BACKEND": backend},
+                check=True,
+            )
+            with open(output, "rb") as f:
+                runs[backend] = pickle.load(f)
+            os.remove(output)
+            run = runs[backend]
+            print(
+                f"{n_countries:>9} {run['rows']:>9} {backend:>8} "
+                f"{run['seconds']:>8.3f} {run['rows'] / run['seconds']:>10.0f} "
+                f"{run['peak_rss_increase_mb']:>9.1f}"
+            )
+        check_parity(runs["pandas"]["results"], runs["polars"]["results"])
+    print(json.dumps({"parity": "ok"}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+import argparse
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import requests
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+
+from src.config import PROJECT_PREFIX, SEVERITIES  # noqa: E402
+
+DASH_UPDATE = "/_dash-update-component"
+
+
+def write_synthetic_outputs(data_dir: str, n_countries: int, seed: int = 0):
+    """
+    Write processed outputs for the latest date, laid out like the blob
+    container, so that the app can run with LOCAL_DATA_DIR=data_dir.
+    """
+    rng = np.random.default_rng(seed)
+    date = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+    year = datetime.now().year
+    years = [year, year - 1, year - 2]
+    countries = [f"Country {i:03d}" for i in range(n_countries)]
+    out_dir = os.path.join(data_dir, PROJECT_PREFIX, "processed", "ipc_updates")
+    ref_dir = os.path.join(data_dir, PROJECT_PREFIX, "processed", "reference_periods")
+    os.makedirs(out_dir, exist_ok=True)
+    os.makedirs(ref_dir, exist_ok=True)
+
+    df_all = []
+    for severity in SEVERITIES:
+        percentages = {y: rng.random(n_countries) for y in years}
+        df = pd.DataFrame({"Country": countries, "Phase": severity})
+        df["Peak Hunger Period"] = "Jun to Sep"
+        df[f"{years[1]} To {years[0]} Change"] = (
+            percentages[years[0]] - percentages[years[1]]
+        ).round(2)
+        df[f"{years[2]} To {years[1]} Change"] = (
+            percentages[years[1]] - percentages[years[2]]
+        ).round(2)
+        for y in years:
+            df[f"{y} Percentage"] = percentages[y]
+        for y in years:
+            df[f"{y} Number"] = rng.integers(1e4, 1e7, n_countries)
+        for y in years:
+            df[f"{y} Report Period"] = "Jun to Sep"
+        for col in ["Data Driven Period", "Expert Period 1", "Expert Period 2"]:
+            df[f"{col} Overlap"] = rng.choice([0, 0.5, 1, np.nan], n_countries)
+        df.to_csv(
+            os.path.join(out_dir, f"annualized_ipc_summary_{severity}_{date}.csv"),
+            index=False,
+        )
+        df_all.append(df)
+    pd.concat(df_all, ignore_index=True).to_csv(
+        os.path.join(out_dir, f"annualized_ipc_summary_all_{date}.csv"), index=False
+    )
+    df_delta = df_all[0].sample(frac=0.1, random_state=seed)
+    df_delta.insert(2, "Change Type", "modified")
+    df_delta.insert(3, "Changed Columns", f"{year} Percentage")
+    df_delta.to_csv(
+        os.path.join(out_dir, f"annualized_ipc_delta_{date}.csv"), index=False
+    )
+    pd.DataFrame(
+        {
+            "Country": [f"C{i:03d}" for i in range(n_countries)],
+            "data_driven_period": "June, July, August",
+            "expert_period_1": "May, June",
+            "expert_period_2": np.nan,
+        }
+    ).to_csv(os.path.join(ref_dir, "cleaned_reference_periods.csv"), index=False)
+
+
+def select_severity(session, base_url, severity):
+    return session.post(
+        base_url + DASH_UPDATE,
+        json={
+            "output": "..data-grid.rowData...data-grid.columnDefs..",
+            "outputs": [
+                {"id": "data-grid", "property": "rowData"},
+                {"id": "data-grid", "property": "columnDefs"},
+            ],
+            "inputs": [
+                {"id": "severity-dropdown", "property": "value", "value": severity}
+            ],
+            "changedPropIds": ["severity-dropdown.value"],
+            "state": [],
+        },
+    )
+
+
+def export_csv(session, base_url, severity):
+    return session.post(
+        base_url + DASH_UPDATE,
+        json={
+            "output": "..data-grid.exportDataAsCsv...data-grid.csvExportParams..",
+            "outputs": [
+                {"id": "data-grid", "property": "exportDataAsCsv"},
+                {"id": "data-grid", "property": "csvExportParams"},
+            ],
+            "inputs": [{"id": "csv-button", "property": "n_clicks", "value": 1}],
+            "changedPropIds": ["csv-button.n_clicks"],
+            "state": [
+                {"id": "severity-dropdown", "property": "value", "value": severity}
+            ],
+        },
+    )
+
+
+def download_reference(session, base_url, severity):
+    return session.post(
+        base_url + DASH_UPDATE,
+        json={
+            "output": "reference-download.data",
+            "outputs": {"id": "reference-download", "property": "data"},
+            "inputs": [
+                {"id": "reference-download-button", "property": "n_clicks", "value": 1}
+            ],
+            "changedPropIds": ["reference-download-button.n_clicks"],
+            "state": [],
+        },
+    )
+
+
+def load_page(session, base_url, severity):
+    # The layout carries the combined summary in clientside mode
+    return session.get(base_url + "/_dash-layout")
+
+
+# Relative frequency of each action in a session, by CLIENTSIDE_FILTERING mode.
+# Actions without a function are handled in the browser and send no request.
+ACTIONS = {
+    "server": [
+        ("select_severity", select_severity, 0.8),
+        ("export_csv", export_csv, 0.1),
+        ("download_reference", download_reference, 0.1),
+    ],
+    "clientside": [
+        ("load_page", load_page, 0.2),
+        ("select_severity", None, 0.6),
+        ("export_csv", export_csv, 0.1),
+        ("download_reference", download_reference, 0.1),
+    ],
+}
+
+
+def run_session(base_url, mode, stop_at, think_time, records, lock, seed):
+    """
+    One analyst: open the app, then switch severities and download CSVs until
+    `stop_at`, pausing up to `think_time` seconds between actions.
+    """
+    rng = random.Random(seed)
+    names, funcs, weights = zip(*ACTIONS[mode])
+    with requests.Session() as session:
+        for path in ["/", "/_dash-layout", "/_dash-dependencies"]:
+            session.get(base_url + path)
+        severity = "3+"
+        while time.monotonic() < stop_at:
+            index = rng.choices(range(len(funcs)), weights=weights)[0]
+            if names[index] == "select_severity":
+                severity = rng.choice(SEVERITIES + ["all"])
+            if funcs[index] is None:
+                time.sleep(rng.uniform(0, think_time))
+                continue
+            start = time.monotonic()
+            try:
+                ok = funcs[index](session, base_url, severity).status_code == 200
+            except requests.RequestException:
+                ok = False
+            with lock:
+                records.append((names[index], time.monotonic() - start, ok))
+            time.sleep(rng.uniform(0, think_time))
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers, threads, data_dir, mode):
+    port = free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "app:server",
+            "--bind",
+            f"127.0.0.1:{port}",
+            "--workers",
+            str(workers),
+            "--threads",
+            str(threads),
+            "--log-level",
+            "warning",
+        ],
+        cwd=ROOT,
+        # Set the mode explicitly rather than inheriting it from the shell or
+        # .env, and leave metrics off so they don't add to the latencies
+        env={
+            **os.environ,
+            "LOCAL_DATA_DIR": data_dir,
+            "CLIENTSIDE_FILTERING": str(mode == "clientside").lower(),
+            "METRICS_ENABLED": "false",
+        },
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            requests.get(base_url + "/_dash-layout", timeout=1)
+            return process, base_url
+        except requests.RequestException:
+            time.sleep(0.5)
+    process.terminate()
+    raise Exception(f"Server with {workers} workers did not start")
+
+
+def run_load(base_url, mode, sessions, duration, think_time):
+    records = []
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+    threads = [
+        threading.Thread(
+            target=run_session,
+            args=(base_url, mode, stop_at, think_time, records, lock, i),
+        )
+        for i in range(sessions)
+    ]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return records, time.monotonic() - start
+
+
+def summarize(records, elapsed):
+    df = pd.DataFrame(records, columns=["action", "seconds", "ok"])
+    rows = []
+    for action, dff in [("all", df)] + list(df.groupby("action")):
+        ms = dff["seconds"] * 1000
+        rows.append(
+            {
+                "action": action,
+                "requests": len(dff),
+                "errors": int((~dff["ok"]).sum()),
+                "req/s": len(dff) / elapsed,
+                "p50 ms": ms.quantile(0.5),
+                "p95 ms": ms.quantile(0.95),
+                "p99 ms": ms.quantile(0.99),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load test the Dash app under gunicorn with synthetic data, "
+        "simulating concurrent analysts switching severities and downloading CSVs."
+    )
+    parser.add_argument(
+        "--configs",
+        nargs="+",
+        default=["1x1", "2x4", "4x4"],
+        help="Gunicorn configurations to test, as WORKERSxTHREADS",
+    )
+    parser.add_argument("--sessions", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--duration", type=float, default=30, help="Seconds per run")
+    parser.add_argument(
+        "--think-time",
+        type=float,
+        default=1.0,
+        help="Maximum pause between a session's actions, in seconds",
+    )
+    parser.add_argument("--countries", type=int, default=60)
+    parser.add_argument(
+        "--clientside",
+        action="store_true",
+        help="Run the app with CLIENTSIDE_FILTERING=true, where severity switches "
+        "send no request and each page load carries the combined summary",
+    )
+    args = parser.parse_args()
+    mode = "clientside" if args.clientside else "server"
+    print(f"Mode: {mode} filtering", flush=True)
+
+    results = []
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_synthetic_outputs(data_dir, args.countries)
+        for config in args.configs:
+            workers, threads = (int(n) for n in config.split("x"))
+            process, base_url = start_server(workers, threads, data_dir, mode)
+            try:
+                for sessions in args.sessions:
+                    records, elapsed = run_load(
+                        base_url, mode, sessions, args.duration, args.think_time
+                    )
+                    df = summarize(records, elapsed)
+                    df.insert(0, "sessions", sessions)
+                    df.insert(0, "config", config)
+                    df.insert(0, "mode", mode)
+                    results.append(df)
+                    print(df.round(1).to_string(index=False), flush=True)
+            finally:
+                process.terminate()
+                process.wait()
+
+    print("\nSummary (all actions):")
+    df_results = pd.concat(results, ignore_index=True)
+    print(
+        df_results[df_results["action"] == "all"]
+        .drop(columns=["action"])
+        .round(1)
+        .to_string(index=False)
+    )
+
+
+if __name__ == "__main__":
+    main()
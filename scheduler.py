@@ -0,0 +1,118 @@
+import logging
+import coloredlogs
+import time
+from datetime import datetime, timedelta
+
+from src import pipeline
+from src.config import (
+    HAPI_SLOW_SECONDS,
+    LOG_LEVEL,
+    POLL_BACKOFF_MAX,
+    POLL_INTERVAL_MAX,
+    POLL_INTERVAL_MIN,
+)
+from src.datasources import ipc
+
+logger = logging.getLogger(__name__)
+coloredlogs.install(level=LOG_LEVEL, logger=logger)
+
+
+def next_interval(interval, changed, slow):
+    """
+    Seconds to wait before the next poll.
+
+    New analyses tend to be released in batches, so poll at the minimum
+    interval after a change and relax gradually while nothing changes. Back
+    off exponentially while HAPI is slow or failing.
+    """
+    if slow:
+        return min(interval * 2, POLL_BACKOFF_MAX)
+    if changed:
+        return POLL_INTERVAL_MIN
+    return min(interval * 1.5, POLL_INTERVAL_MAX)
+
+
+def changed_countries(latest, current):
+    """
+    ISO3 codes of countries whose newest reference period start differs
+    between two polls.
+    """
+    return sorted(iso3 for iso3, start in current.items() if latest.get(iso3) != start)
+
+
+def update_countries(summaries, iso3s, now):
+    """
+    Recompute and splice in the rows of countries with new analyses, one
+    country at a time so that a failing country doesn't hold up the others.
+
+    Countries not covered by the daily run are ignored, as they would be
+    dropped again by the next one. Countries that fail to update keep their
+    current rows until the next full run.
+
+    Returns
+    -------
+    tuple[list, dict]
+        ISO3 codes of the countries that were updated, and the updated
+        summaries
+    """
+    tracked = set(summaries[pipeline.REF_SEVERITY]["Country"])
+    untracked = [iso3 for iso3 in iso3s if iso3 not in tracked]
+    if untracked:
+        logger.info(
+            f"Ignoring new analyses for countries not in the outputs: {untracked}"
+        )
+    updated = []
+    for iso3 in iso3s:
+        if iso3 not in tracked:
+            continue
+        logger.info(f"New IPC analysis for {iso3}, updating outputs...")
+        try:
+            # Raises rather than returning no rows, so a failed fetch can't
+            # drop the country from the outputs
+            df = ipc.get_ipc_from_hapi(iso3)
+            updates = pipeline.compute_summaries(df, now)
+            summaries = pipeline.splice_summaries(summaries, updates, [iso3])
+            updated.append(iso3)
+        except Exception as e:
+            logger.warning(f"Could not update {iso3}, keeping its current rows: {e}")
+    return updated, summaries
+
+
+if __name__ == "__main__":
+    summaries = None
+    run_date = None
+    latest = None
+    interval = POLL_INTERVAL_MIN
+
+    while True:
+        now = pipeline.output_date()
+        changed = []
+        try:
+            start = time.monotonic()
+            current = ipc.get_latest_reference_periods(
+                datetime.now() - timedelta(days=2 * 365)
+            )
+            slow = time.monotonic() - start > HAPI_SLOW_SECONDS
+
+            if summaries is None or run_date != now.date():
+                # Rebuild everything once a day, as the reference year and the
+                # window used to find peak periods move with the date
+                logger.info("Running full pipeline...")
+                summaries = pipeline.run(now, checkpoints=False)
+                run_date = now.date()
+            else:
+                changed, summaries = update_countries(
+                    summaries, changed_countries(latest, current), now
+                )
+                if changed:
+                    pipeline.publish(summaries, now)
+            # Only mark analyses as seen once their outputs are published, so
+            # that failed uploads are retried on the next poll
+            latest = current
+        except Exception as e:
+            logger.warning(f"Polling failed, backing off: {e}")
+            slow = True
+
+        interval = next_interval(interval, bool(changed), slow)
+        logger.debug(f"Next poll in {interval / 60:.1f} minutes")
+        time.sleep(interval)
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import logging
+import coloredlogs
+from datetime import datetime
+from flask import Blueprint, Response, request
+from src.config import API_MAX_AGE, LOG_LEVEL, SEVERITIES
+from src.datasources import summary
+
+
+logger = logging.getLogger(__name__)
+coloredlogs.install(level=LOG_LEVEL, logger=logger)
+
+api = Blueprint("api", __name__, url_prefix="/api")
+
+
+def register_api(server):
+    """
+    Register the read-only JSON API on the Flask server behind the Dash app.
+
+    Parameters
+    ----------
+    server : flask.Flask
+        Server to attach the routes to, ie. `app.server`.
+    """
+    server.register_blueprint(api)
+
+
+@api.route("/summary")
+def get_summary():
+    """
+    Annualized IPC summary for a severity level.
+
+    Query parameters: `severity` (default "3+", or "all"), `date` (YYYY-MM-DD,
+    default is the latest run), `columns` and `country` (comma separated or
+    repeated).
+    """
+    # A literal "+" in a query string decodes to a space, so `severity=3+`
+    # arrives as "3 "
+    severity = request.args.get("severity", "3+").replace(" ", "+")
+    if severity not in SEVERITIES + ["all"]:
+        return _error(400, f"Unknown severity: {severity}")
+
+    date = request.args.get("date") or summary.latest_date()
+    try:
+        datetime.strptime(date, "%Y-%m-%d")
+    except ValueError:
+        return _error(400, f"Invalid date, expected YYYY-MM-DD: {date}")
+
+    try:
+        df, etag = summary.load_summary(severity, date)
+    except FileNotFoundError:
+        logger.warning(f"No summary available for severity {severity} on {date}")
+        return _error(404, f"No summary available for severity {severity} on {date}")
+
+    return _filtered_response(
+        df, etag, {"severity": severity, "date": date}, key=f"{severity}|{date}"
+    )
+
+
+@api.route("/delta")
+def get_delta():
+    """
+    Rows of the combined summary that changed since the previous run.
+
+    Query parameters: `date` (YYYY-MM-DD, default is the latest run), `columns`
+    and `country` (comma separated or repeated).
+    """
+    date = request.args.get("date") or summary.latest_date()
+    try:
+        datetime.strptime(date, "%Y-%m-%d")
+    except ValueError:
+        return _error(400, f"Invalid date, expected YYYY-MM-DD: {date}")
+
+    try:
+        df, etag = summary.load_delta(date)
+    except FileNotFoundError:
+        logger.warning(f"No delta available on {date}")
+        return _error(404, f"No delta available on {date}")
+
+    return _filtered_response(df, etag, {"date": date}, key=f"delta|{date}")
+
+
+@api.route("/reference-periods")
+def get_reference_periods():
+    """
+    Expert reference hunger periods by country.
+
+    Query parameters: `columns` and `country` (comma separated or repeated).
+    """
+    try:
+        df, etag = summary.load_reference_periods()
+    except FileNotFoundError:
+        logger.warning("Reference periods have not been published")
+        return _error(404, "Reference periods are not available")
+    return _filtered_response(df, etag, {}, key="reference-periods")
+
+
+@api.errorhandler(500)
+def internal_error(e):
+    """
+    Report failures other than missing data, eg. storage outages, as JSON.
+    Flask has already logged the exception.
+    """
+    return _error(500, "Data could not be loaded, try again later")
+
+
+def _split_arg(name):
+    values = []
+    for value in request.args.getlist(name):
+        values.extend(v.strip() for v in value.split(",") if v.strip())
+    return values
+
+
+def _filtered_response(df, data_etag, metadata, key):
+    columns = _split_arg("columns")
+    countries = _split_arg("country")
+
+    unknown = [col for col in columns if col not in df.columns]
+    if unknown:
+        return _error(400, f"Unknown columns: {unknown}")
+    if countries and "Country" not in df.columns:
+        return _error(400, "Data cannot be filtered by country")
+
+    # The body is fully determined by the data and the query, so the ETag can
+    # be derived from them without serializing anything
+    fingerprint = "|".join(
+        [
+            data_etag,
+            key,
+            ",".join(columns),
+            ",".join(sorted(c.lower() for c in countries)),
+        ]
+    )
+    etag = hashlib.sha256(fingerprint.encode()).hexdigest()[:32]
+
+    def build_body():
+        dff = df
+        if countries:
+            wanted = {c.lower() for c in countries}
+            dff = dff[dff["Country"].astype(str).str.lower().isin(wanted)]
+        if columns:
+            dff = dff[columns]
+        records = dff.astype(object).where(dff.notna(), None).to_dict("records")
+        return json.dumps(
+            {**metadata, "columns": list(dff.columns), "data": records},
+            allow_nan=False,
+        )
+
+    return _conditional_response(etag, build_body)
+
+
+def _conditional_response(etag, build_body):
+    # If-None-Match uses weak comparison, so that ETags weakened by proxies
+    # that re-encode the body still match
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = Response(build_body(), mimetype="application/json")
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = API_MAX_AGE
+    return response
+
+
+def _error(status, message):
+    return Response(
+        json.dumps({"error": message}), status=status, mimetype="application/json"
+    )
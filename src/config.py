@@ -1,2 +1,51 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
 LOG_LEVEL = "DEBUG"
 PROJECT_PREFIX = "ds-ufe-food-security"
+
+# Severity levels published by the pipeline
+SEVERITIES = ["3", "3+", "4", "4+", "5"]
+
+# Seconds that processed summaries are kept in memory by the app before they
+# are re-read from blob
+SUMMARY_CACHE_TTL = 60 * 60
+# Shorter lifetime for the latest date's outputs, which `scheduler.py` can
+# republish during the day. A new analysis reaches users at most one poll
+# interval plus this long after it appears on HAPI.
+LATEST_CACHE_TTL = 5 * 60
+# Seconds that API clients may reuse a response before revalidating it
+API_MAX_AGE = 5 * 60
+
+# Set LOCAL_DATA_DIR to make the app read processed outputs from a local
+# directory laid out like the blob container, eg. for load testing
+LOCAL_DATA_DIR = os.getenv("LOCAL_DATA_DIR")
+
+# Set METRICS_ENABLED=true to record request metrics and serve them on /metrics
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+# Directory where each worker process writes its metrics so that /metrics can
+# report totals across workers. Defaults to a temporary directory per gunicorn
+# master process.
+METRICS_DIR = os.getenv("METRICS_DIR")
+
+# Set CLIENTSIDE_FILTERING=true to send the combined summary to the browser once
+# per page load and switch severity levels without a server round trip
+CLIENTSIDE_FILTERING = os.getenv("CLIENTSIDE_FILTERING", "false").lower() == "true"
+
+# Adaptive polling of HAPI by `scheduler.py`, in seconds. Polls speed up to the
+# minimum interval after a change and relax towards the maximum when nothing
+# changes. Slow or failed polls back off up to POLL_BACKOFF_MAX.
+POLL_INTERVAL_MIN = 5 * 60
+POLL_INTERVAL_MAX = 30 * 60
+POLL_BACKOFF_MAX = 2 * 60 * 60
+HAPI_TIMEOUT = 60
+HAPI_SLOW_SECONDS = 20
+
+# Local directory for pipeline stage checkpoints, see `src/utils/checkpoint_utils.py`
+CHECKPOINT_DIR = os.getenv("CHECKPOINT_DIR", ".checkpoints")
+CHECKPOINT_MAX_AGE_DAYS = 7
+
+# Engine for the IPC processing steps, "pandas" or "polars" (requires polars)
+COMPUTE_BACKEND = os.getenv("COMPUTE_BACKEND", "pandas")
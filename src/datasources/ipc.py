@@ -2,7 +2,8 @@ import ocha_stratus as stratus
 import pandas as pd
 import logging
 import coloredlogs
-from src.config import LOG_LEVEL, PROJECT_PREFIX
+from src.config import COMPUTE_BACKEND, HAPI_TIMEOUT, LOG_LEVEL, PROJECT_PREFIX
+from src.datasources import ipc_polars
 from src.utils import date_utils
 import requests
 from dotenv import load_dotenv
@@ -29,7 +30,8 @@ def get_ipc_from_hapi(iso3):
         "offset": 0,
     }
     # Check if the request was successful
-    response = requests.get(endpoint, params=params)
+    response = requests.get(endpoint, params=params, timeout=HAPI_TIMEOUT)
+    response.raise_for_status()
     json_data = response.json()
     # Extract the data list from the JSON
     data_list = json_data.get("data", [])
@@ -54,9 +56,10 @@ def get_ipc_from_hapi(iso3):
     ]
 
 
-def get_all_ipc():
-    df_raw = get_raw_ipc()
-    iso3s = df_raw.Country.unique()
+def get_all_ipc(iso3s=None):
+    if iso3s is None:
+        df_raw = get_raw_ipc()
+        iso3s = df_raw.Country.unique()
     dfs = []
     logger.info("Getting data for all IOS3s from HAPI...")
     for iso3 in iso3s:
@@ -69,6 +72,53 @@ def get_all_ipc():
     return pd.concat(dfs)
 
 
+def get_latest_reference_periods(since: datetime) -> pd.Series:
+    """
+    Get the newest reference period start for each country from HAPI.
+
+    Only national 3+ figures starting after `since` are requested, so that
+    polling for new analyses stays cheap.
+
+    Parameters
+    ----------
+    since : datetime.datetime
+        Earliest reference period start to consider.
+
+    Returns
+    -------
+    pandas.Series
+        Newest `reference_period_start` (as returned by HAPI), indexed by
+        `location_code`
+    """
+    endpoint = (
+        "https://hapi.humdata.org/api/v2/food-security-nutrition-poverty/food-security"
+    )
+    limit = 10000
+    params = {
+        "app_identifier": os.getenv("HAPI_APP_IDENTIFIER"),
+        "admin_level": 0,
+        "ipc_phase": "3+",
+        "reference_period_start_min": since.strftime("%Y-%m-%d"),
+        "output_format": "json",
+        "limit": limit,
+        "offset": 0,
+    }
+    data_list = []
+    while True:
+        response = requests.get(endpoint, params=params, timeout=HAPI_TIMEOUT)
+        response.raise_for_status()
+        page = response.json().get("data", [])
+        data_list.extend(page)
+        if len(page) < limit:
+            break
+        params["offset"] += limit
+
+    df_response = pd.DataFrame(
+        data_list, columns=["location_code", "reference_period_start"]
+    )
+    return df_response.groupby("location_code")["reference_period_start"].max()
+
+
 def get_raw_ipc() -> pd.DataFrame:
     """
     Retrieve raw IPC (Integrated Food Security Phase Classification) data from blob storage.
@@ -136,6 +186,8 @@ def identify_peak_hunger_period(
         DataFrame containing countries with their reference periods of peak hunger,
         sorted alphabetically by country name.
     """
+    if COMPUTE_BACKEND == "polars":
+        return ipc_polars.identify_peak_hunger_period(df, year, severity)
     df = df.copy()
     # Filter to a specific year
     last_year = datetime.now() - timedelta(days=365)
@@ -207,6 +259,8 @@ def match_peak_hunger_period(
         DataFrame containing food insecurity data for the specified year that matches
         the peak hunger period, with columns renamed to include the year.
     """
+    if COMPUTE_BACKEND == "polars":
+        return ipc_polars.match_peak_hunger_period(df, df_peak, year, severity)
     # Create a new DataFrame explicitly instead of a view
     df_year = df[(df.year == year) & (df["ipc_phase"] == severity)].copy()
 
@@ -281,6 +335,8 @@ def add_yoy_changes(df, years):
 
 
 def combine_4_plus(df_all):
+    if COMPUTE_BACKEND == "polars":
+        return ipc_polars.combine_4_plus(df_all)
     df = df_all.copy()
     mapping = {"4": "4+", "5": "4+"}
     df["ipc_phase"] = df["ipc_phase"].map(mapping).fillna(df["ipc_phase"])
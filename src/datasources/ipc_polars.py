@@ -0,0 +1,192 @@
+import logging
+import coloredlogs
+import pandas as pd
+from datetime import datetime, timedelta
+from src.config import LOG_LEVEL
+from src.utils.polars_utils import pl, require_polars
+
+logger = logging.getLogger(__name__)
+coloredlogs.install(level=LOG_LEVEL, logger=logger)
+
+IPC_TYPE_ORDER = ["current", "second_projection", "first_projection"]
+
+# Polars versions of the processing steps in `ipc`, used in their place when
+# COMPUTE_BACKEND is "polars". The Polars version of `date_utils.apply_overlap`
+# lives next to it. They take and return pandas DataFrames with the same
+# signatures, and run the filtering, sorting, de-duplication and joins on Polars
+# lazy frames. Sorts are stable, so among exact ties they keep the first row in
+# input order, where the pandas versions keep an arbitrary one.
+
+
+def _to_intervals(left, right) -> pd.arrays.IntervalArray:
+    return pd.arrays.IntervalArray.from_arrays(
+        pd.Series(left, dtype="datetime64[ns]"),
+        pd.Series(right, dtype="datetime64[ns]"),
+        closed="both",
+    )
+
+
+def combine_4_plus(df_all: pd.DataFrame) -> pd.DataFrame:
+    """
+    Polars version of `ipc.combine_4_plus()`.
+    """
+    require_polars()
+    keys = ["From", "To", "location_code", "ipc_type", "year", "ipc_phase"]
+    lf = pl.from_pandas(df_all).lazy()
+    lf_combined = (
+        lf.with_columns(pl.col("ipc_phase").replace({"4": "4+", "5": "4+"}))
+        .filter(pl.col("ipc_phase") == "4+")
+        .drop_nulls(keys)
+        .group_by(keys)
+        .agg(
+            pl.col("population_in_phase").sum(),
+            pl.col("population_fraction_in_phase").sum(),
+        )
+        .sort(keys)
+    )
+    df_combined = lf_combined.collect().to_pandas()
+    return pd.concat([df_all, df_combined])
+
+
+def identify_peak_hunger_period(
+    df: pd.DataFrame, year: int, severity: str
+) -> pd.DataFrame:
+    """
+    Polars version of `ipc.identify_peak_hunger_period()`.
+    """
+    require_polars()
+    last_year = datetime.now() - timedelta(days=365)
+    lf = pl.from_pandas(
+        df[
+            [
+                "location_code",
+                "ipc_phase",
+                "ipc_type",
+                "population_fraction_in_phase",
+                "From",
+                "To",
+            ]
+        ]
+    ).lazy()
+    df_filtered = (
+        # Note that `year` is associated with the `To` date
+        lf.filter((pl.col("To") >= last_year) & (pl.col("ipc_phase") == severity))
+        # Get the most recent report if there are duplicates for the same time period
+        .with_columns(
+            pl.col("ipc_type")
+            .replace_strict(IPC_TYPE_ORDER, range(len(IPC_TYPE_ORDER)), default=None)
+            .alias("type_order")
+        )
+        .sort("type_order", nulls_last=True, maintain_order=True)
+        .unique(
+            subset=["location_code", "From", "To"], keep="first", maintain_order=True
+        )
+        # Now pick the one that has the highest food insecurity
+        .sort(
+            "population_fraction_in_phase",
+            descending=True,
+            nulls_last=True,
+            maintain_order=True,
+        )
+        .unique(subset=["location_code"], keep="first", maintain_order=True)
+        .sort("location_code", maintain_order=True)
+        .select("location_code", "From", "To")
+        .collect()
+    )
+
+    # Check for any missing countries
+    missing_countries = list(
+        set(df["location_code"]) - set(df_filtered["location_code"].to_list())
+    )
+    if missing_countries:
+        logger.warning(
+            f"Warning! {len(missing_countries)} countries do not have reports from {year}: {missing_countries}"
+        )
+
+    df_peak = pd.DataFrame(
+        {
+            "location_code": df_filtered["location_code"].to_list(),
+            "reference_year": df_filtered["To"].dt.year().cast(pl.Int64).to_numpy(),
+        }
+    )
+    df_peak["reference_period"] = _to_intervals(
+        df_filtered["From"].to_numpy(), df_filtered["To"].to_numpy()
+    )
+    return df_peak
+
+
+def match_peak_hunger_period(
+    df: pd.DataFrame, df_peak: pd.DataFrame, year: int, severity: str
+) -> pd.DataFrame:
+    """
+    Polars version of `ipc.match_peak_hunger_period()`.
+    """
+    require_polars()
+    reference_period = pd.IntervalIndex(df_peak["reference_period"])
+    lf_peak = pl.from_pandas(
+        pd.DataFrame(
+            {
+                "location_code": df_peak["location_code"].to_numpy(),
+                "reference_year": df_peak["reference_year"].to_numpy(),
+                "peak_start": reference_period.left,
+                "peak_end": reference_period.right,
+            }
+        )
+    ).lazy()
+    lf = pl.from_pandas(
+        df[
+            [
+                "location_code",
+                "ipc_phase",
+                "population_in_phase",
+                "population_fraction_in_phase",
+                "From",
+                "To",
+                "year",
+            ]
+        ]
+    ).lazy()
+
+    ref_year = pl.col("reference_year").cast(pl.Int64)
+    # Account for the Jan - Dec cross
+    from_year = ref_year - (pl.col("From").dt.month() > pl.col("To").dt.month()).cast(
+        pl.Int64
+    )
+    df_matched = (
+        lf.filter((pl.col("year") == year) & (pl.col("ipc_phase") == severity))
+        .join(lf_peak, on="location_code", how="inner", maintain_order="left")
+        .with_columns(
+            pl.datetime(from_year, pl.col("From").dt.month(), pl.col("From").dt.day())
+            .dt.cast_time_unit("ns")
+            .alias("ref_start"),
+            pl.datetime(ref_year, pl.col("To").dt.month(), 1)
+            .dt.month_end()
+            .dt.cast_time_unit("ns")
+            .alias("ref_end"),
+        )
+        # Get only the ones that have overlap
+        .filter(
+            (pl.col("ref_start") <= pl.col("peak_end"))
+            & (pl.col("peak_start") <= pl.col("ref_end"))
+        )
+        # Now drop duplicate countries and get the one with the worst conditions
+        .sort(
+            "population_fraction_in_phase",
+            descending=True,
+            nulls_last=True,
+            maintain_order=True,
+        )
+        .unique(subset=["location_code"], keep="first", maintain_order=True)
+        .sort("location_code", maintain_order=True)
+        .collect()
+    )
+
+    df_clean = pd.DataFrame({"location_code": df_matched["location_code"].to_list()})
+    df_clean[f"{year}_report_period"] = _to_intervals(
+        df_matched["From"].to_numpy(), df_matched["To"].to_numpy()
+    )
+    df_clean[f"{year}_number"] = df_matched["population_in_phase"].to_numpy()
+    df_clean[f"{year}_percentage"] = df_matched[
+        "population_fraction_in_phase"
+    ].to_numpy()
+    return df_clean
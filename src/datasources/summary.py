@@ -0,0 +1,268 @@
+import ocha_stratus as stratus
+import pandas as pd
+import logging
+import coloredlogs
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from azure.core.exceptions import ResourceNotFoundError
+from src.config import (
+    LATEST_CACHE_TTL,
+    LOCAL_DATA_DIR,
+    LOG_LEVEL,
+    PROJECT_PREFIX,
+    SUMMARY_CACHE_TTL,
+)
+from src import metrics
+
+
+logger = logging.getLogger(__name__)
+coloredlogs.install(level=LOG_LEVEL, logger=logger)
+
+REFERENCE_PERIODS_BLOB = (
+    f"{PROJECT_PREFIX}/processed/reference_periods/cleaned_reference_periods.csv"
+)
+
+# Maps blob name -> (DataFrame, ETag, monotonic expiry time). The DataFrame
+# and ETag are None for blobs that were not found
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def latest_date() -> str:
+    """
+    Date stamp of the most recent pipeline outputs.
+
+    The nightly pipeline stamps its outputs with the previous day's date.
+
+    Returns
+    -------
+    str
+        Date formatted as YYYY-MM-DD
+    """
+    yesterday = datetime.now() - timedelta(days=1)
+    return yesterday.strftime("%Y-%m-%d")
+
+
+def summary_blob_name(severity: str, date: str) -> str:
+    """
+    Blob name of the annualized IPC summary for a severity level and date.
+
+    Parameters
+    ----------
+    severity : str
+        IPC phase severity (eg. "3+"), or "all" for the combined file.
+    date : str
+        Date stamp of the output, formatted as YYYY-MM-DD.
+
+    Returns
+    -------
+    str
+        Blob name relative to the project container
+    """
+    return (
+        f"{PROJECT_PREFIX}/processed/ipc_updates/"
+        f"annualized_ipc_summary_{severity}_{date}.csv"
+    )
+
+
+def delta_blob_name(date: str) -> str:
+    """
+    Blob name of the delta between the combined summary for a date and the
+    previously published one.
+
+    Parameters
+    ----------
+    date : str
+        Date stamp of the output, formatted as YYYY-MM-DD.
+
+    Returns
+    -------
+    str
+        Blob name relative to the project container
+    """
+    return f"{PROJECT_PREFIX}/processed/ipc_updates/annualized_ipc_delta_{date}.csv"
+
+
+def changelog_blob_name(date: str) -> str:
+    """
+    Blob name of the Markdown changelog accompanying the delta for a date.
+    """
+    return f"{PROJECT_PREFIX}/processed/ipc_updates/ipc_changelog_{date}.md"
+
+
+def previous_date(date: str) -> str:
+    """
+    Find the most recent combined summary published before a date.
+
+    Parameters
+    ----------
+    date : str
+        Date stamp to look before, formatted as YYYY-MM-DD.
+
+    Returns
+    -------
+    str
+        Date stamp of the previous combined summary, or None if there is none
+    """
+    prefix = f"{PROJECT_PREFIX}/processed/ipc_updates/annualized_ipc_summary_all_"
+    dates = [
+        blob[len(prefix) : -len(".csv")]
+        for blob in stratus.list_container_blobs(name_starts_with=prefix)
+        if blob.endswith(".csv")
+    ]
+    earlier = [d for d in dates if d < date]
+    return max(earlier) if earlier else None
+
+
+def compute_etag(df: pd.DataFrame) -> str:
+    """
+    Compute a strong ETag from the content of a DataFrame.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Data to fingerprint.
+
+    Returns
+    -------
+    str
+        Hex digest that changes whenever the columns or values change
+    """
+    digest = hashlib.sha256()
+    digest.update("\x1f".join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()[:32]
+
+
+def load_summary(severity: str, date: str = None) -> tuple[pd.DataFrame, str]:
+    """
+    Load a processed IPC summary, served from memory when recently read.
+
+    Parameters
+    ----------
+    severity : str
+        IPC phase severity (eg. "3+"), or "all" for the combined file.
+    date : str, optional
+        Date stamp of the output, formatted as YYYY-MM-DD. Defaults to the
+        most recent pipeline run.
+
+    Returns
+    -------
+    tuple[pandas.DataFrame, str]
+        The summary data and its ETag. The DataFrame is shared between callers
+        and must not be modified in place.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the output has not been published.
+    """
+    date = date or latest_date()
+    return _load_cached(summary_blob_name(severity, date), "summary", _ttl(date))
+
+
+def load_delta(date: str = None) -> tuple[pd.DataFrame, str]:
+    """
+    Load the rows of the combined summary that changed since the previous
+    run, served from memory when recently read.
+
+    Parameters
+    ----------
+    date : str, optional
+        Date stamp of the output, formatted as YYYY-MM-DD. Defaults to the
+        most recent pipeline run.
+
+    Returns
+    -------
+    tuple[pandas.DataFrame, str]
+        The delta, as produced by `delta_utils.compute_delta()`, and its ETag.
+        The DataFrame is shared between callers and must not be modified in
+        place.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the output has not been published.
+    """
+    date = date or latest_date()
+    return _load_cached(delta_blob_name(date), "delta", _ttl(date))
+
+
+def load_reference_periods() -> tuple[pd.DataFrame, str]:
+    """
+    Load the cleaned expert reference hunger periods, served from memory when
+    recently read.
+
+    Returns
+    -------
+    tuple[pandas.DataFrame, str]
+        The reference periods and their ETag. The DataFrame is shared between
+        callers and must not be modified in place.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the output has not been published.
+    """
+    return _load_cached(REFERENCE_PERIODS_BLOB, "reference_periods", SUMMARY_CACHE_TTL)
+
+
+def clear_cache():
+    """
+    Drop all cached blobs so that the next load reads from storage.
+    """
+    with _cache_lock:
+        _cache.clear()
+
+
+def _ttl(date):
+    # Outputs for the latest date can be republished when new analyses appear
+    return LATEST_CACHE_TTL if date == latest_date() else SUMMARY_CACHE_TTL
+
+
+def _load_cached(blob_name: str, kind: str, ttl: float) -> tuple[pd.DataFrame, str]:
+    now = time.monotonic()
+    with _cache_lock:
+        entry = _cache.get(blob_name)
+        if entry is not None and now < entry[2]:
+            metrics.increment("ipc_app_cache_requests_total", kind=kind, result="hit")
+            if entry[0] is None:
+                raise FileNotFoundError(f"Blob not found: {blob_name}")
+            return entry[0], entry[1]
+
+    metrics.increment("ipc_app_cache_requests_total", kind=kind, result="miss")
+    try:
+        with metrics.timer("ipc_app_blob_read_seconds", kind=kind):
+            df = _read_csv(blob_name)
+    except FileNotFoundError:
+        # Remember that the blob is missing too, so that callers polling for
+        # it don't go back to storage on every request
+        logger.warning(f"{blob_name} not found, caching the miss")
+        _store(blob_name, None, None, now + ttl)
+        raise
+    etag = compute_etag(df)
+    _store(blob_name, df, etag, now + ttl)
+    return df, etag
+
+
+def _read_csv(blob_name):
+    if LOCAL_DATA_DIR:
+        logger.debug(f"Loading {blob_name} from {LOCAL_DATA_DIR}...")
+        return pd.read_csv(os.path.join(LOCAL_DATA_DIR, blob_name))
+    logger.debug(f"Loading {blob_name} from blob...")
+    try:
+        return stratus.load_csv_from_blob(blob_name)
+    except ResourceNotFoundError as e:
+        raise FileNotFoundError(f"Blob not found: {blob_name}") from e
+
+
+def _store(blob_name, df, etag, expires):
+    now = time.monotonic()
+    with _cache_lock:
+        # Drop anything that has expired so old dates don't accumulate
+        for key in [k for k, v in _cache.items() if now >= v[2]]:
+            del _cache[key]
+        _cache[blob_name] = (df, etag, expires)
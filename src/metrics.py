@@ -0,0 +1,287 @@
+import bisect
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from flask import Response, g, request
+from src.config import METRICS_DIR, METRICS_ENABLED
+
+
+# Upper bounds of the histogram buckets, in seconds and bytes respectively
+LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+BYTES_BUCKETS = [1_000, 10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000]
+
+_HELP = {
+    "ipc_app_request_seconds": "Time to handle a Dash callback or API request.",
+    "ipc_app_response_bytes": "Size of the response body sent to the client.",
+    "ipc_app_blob_read_seconds": "Time to read and parse a CSV from blob storage.",
+    "ipc_app_cache_requests_total": "Lookups of the in-memory blob cache.",
+}
+
+# Maps metric name -> {labels: (bounds, [bucket counts..., sum, count])} for
+# histograms and metric name -> {labels: count} for counters, for this process
+_histograms = {}
+_counters = {}
+_lock = threading.Lock()
+# Whether anything was recorded since the last flush()
+_dirty = False
+# Held while writing, so that an older snapshot can't replace a newer one
+_flush_lock = threading.Lock()
+
+
+def observe(name: str, value: float, buckets: list = LATENCY_BUCKETS, **labels):
+    """
+    Record a value in a histogram. Does nothing unless metrics are enabled.
+
+    Parameters
+    ----------
+    name : str
+        Metric name.
+    value : float
+        Observed value.
+    buckets : list, optional
+        Upper bounds of the histogram buckets, used when the series is created.
+    **labels
+        Label values identifying the series.
+    """
+    global _dirty
+    if not METRICS_ENABLED:
+        return
+    key = tuple(sorted(labels.items()))
+    with _lock:
+        _dirty = True
+        series = _histograms.setdefault(name, {})
+        if key not in series:
+            series[key] = (buckets, [0] * len(buckets) + [0.0, 0])
+        bounds, values = series[key]
+        index = bisect.bisect_left(bounds, value)
+        if index < len(bounds):
+            values[index] += 1
+        values[-2] += value
+        values[-1] += 1
+
+
+def increment(name: str, amount: int = 1, **labels):
+    """
+    Increment a counter. Does nothing unless metrics are enabled.
+
+    Parameters
+    ----------
+    name : str
+        Metric name.
+    amount : int, optional
+        Amount to add to the counter.
+    **labels
+        Label values identifying the series.
+    """
+    global _dirty
+    if not METRICS_ENABLED:
+        return
+    key = tuple(sorted(labels.items()))
+    with _lock:
+        _dirty = True
+        series = _counters.setdefault(name, {})
+        series[key] = series.get(key, 0) + amount
+
+
+@contextmanager
+def timer(name: str, **labels):
+    """
+    Time the enclosed block and record it in a latency histogram.
+    """
+    if not METRICS_ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+
+def flush():
+    """
+    Write the metrics of this process to the shared metrics directory, where
+    render() picks them up. Called after each request, as gunicorn workers
+    don't share memory and a scrape only reaches one of them.
+    """
+    global _dirty
+    if not METRICS_ENABLED:
+        return
+    with _flush_lock:
+        with _lock:
+            if not _dirty:
+                return
+            _dirty = False
+            snapshot = _snapshot()
+        _write_snapshot(snapshot)
+
+
+def render() -> str:
+    """
+    Render all recorded metrics in the Prometheus text exposition format.
+
+    Returns
+    -------
+    str
+        Metrics summed over all worker processes of the server, including
+        workers that have since exited so that counters never go backwards
+    """
+    flush()
+    counters, histograms = _collect()
+    lines = []
+    for name, series in sorted(counters.items()):
+        lines += [
+            f"# HELP {name} {_HELP.get(name, name)}",
+            f"# TYPE {name} counter",
+        ]
+        for key, count in sorted(series.items()):
+            lines.append(f"{name}{_format_labels(key)} {count}")
+    for name, series in sorted(histograms.items()):
+        lines += [
+            f"# HELP {name} {_HELP.get(name, name)}",
+            f"# TYPE {name} histogram",
+        ]
+        for key, (bounds, values) in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, values):
+                cumulative += count
+                le = _format_labels(key + (("le", str(bound)),))
+                lines.append(f"{name}_bucket{le} {cumulative}")
+            le = _format_labels(key + (("le", "+Inf"),))
+            lines.append(f"{name}_bucket{le} {values[-1]}")
+            lines.append(f"{name}_sum{_format_labels(key)} {values[-2]:.6f}")
+            lines.append(f"{name}_count{_format_labels(key)} {values[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+def register_metrics(app):
+    """
+    Instrument Dash callbacks and API routes, and expose a Prometheus `/metrics`
+    route on the app's server. Nothing is registered unless `METRICS_ENABLED`
+    is set, so there is no overhead when metrics are off.
+
+    Parameters
+    ----------
+    app : dash.Dash
+        App to instrument.
+    """
+    if not METRICS_ENABLED:
+        return
+    server = app.server
+
+    @server.before_request
+    def _start_timer():
+        g.metrics_start = time.perf_counter()
+
+    @server.after_request
+    def _record_request(response):
+        start = g.pop("metrics_start", None)
+        handler = _handler_name(app)
+        if start is None or handler is None:
+            # Page loads can still read blobs, eg. for the clientside store
+            flush()
+            return response
+        observe("ipc_app_request_seconds", time.perf_counter() - start, handler=handler)
+        # Streamed responses have no known length up front
+        if response.content_length is not None:
+            observe(
+                "ipc_app_response_bytes",
+                response.content_length,
+                buckets=BYTES_BUCKETS,
+                handler=handler,
+            )
+        flush()
+        return response
+
+    @server.route("/metrics")
+    def _metrics():
+        return Response(render(), mimetype="text/plain; version=0.0.4")
+
+
+def _snapshot():
+    # Values are copied, as recording continues while the snapshot is written
+    return {
+        "counters": {
+            name: [[list(key), count] for key, count in series.items()]
+            for name, series in _counters.items()
+        },
+        "histograms": {
+            name: [
+                [list(key), bounds, list(values)] for key, (bounds, values) in s.items()
+            ]
+            for name, s in _histograms.items()
+        },
+    }
+
+
+def _write_snapshot(snapshot):
+    directory = _metrics_dir()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{os.getpid()}.json")
+    # Write to a temporary file first so a scrape never reads a partial file
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(snapshot, f)
+    os.replace(f"{path}.tmp", path)
+
+
+def _metrics_dir():
+    # Workers forked by the same gunicorn master share its pid as their parent
+    return METRICS_DIR or os.path.join(
+        tempfile.gettempdir(), f"ipc_app_metrics_{os.getppid()}"
+    )
+
+
+def _collect():
+    counters = {}
+    histograms = {}
+    directory = _metrics_dir()
+    if not os.path.isdir(directory):
+        return counters, histograms
+    for fname in sorted(os.listdir(directory)):
+        if not fname.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(directory, fname)) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            # Removed or replaced while listing
+            continue
+        for name, entries in snapshot["counters"].items():
+            series = counters.setdefault(name, {})
+            for key, count in entries:
+                key = tuple(tuple(pair) for pair in key)
+                series[key] = series.get(key, 0) + count
+        for name, entries in snapshot["histograms"].items():
+            series = histograms.setdefault(name, {})
+            for key, bounds, values in entries:
+                key = tuple(tuple(pair) for pair in key)
+                if key not in series:
+                    series[key] = (bounds, [0] * len(bounds) + [0.0, 0])
+                totals = series[key][1]
+                for i, value in enumerate(values):
+                    totals[i] += value
+    return counters, histograms
+
+
+def _handler_name(app):
+    if request.path.endswith("/_dash-update-component"):
+        body = request.get_json(silent=True) or {}
+        callback = app.callback_map.get(body.get("output"), {}).get("callback")
+        return getattr(callback, "__name__", body.get("output"))
+    if request.blueprint == "api":
+        return request.endpoint
+    return None
+
+
+def _format_labels(key):
+    if not key:
+        return ""
+    pairs = ",".join(f'{k}="{_escape(v)}"' for k, v in key)
+    return "{" + pairs + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,293 @@
+import ocha_stratus as stratus
+import pandas as pd
+import logging
+import coloredlogs
+from datetime import datetime, timedelta
+from functools import partial
+
+from azure.storage.blob import ContentSettings
+
+from src.datasources import ipc, summary
+from src.config import LOG_LEVEL, PROJECT_PREFIX, SEVERITIES
+from src.utils import checkpoint_utils, date_utils, delta_utils, format_utils
+
+logger = logging.getLogger(__name__)
+coloredlogs.install(level=LOG_LEVEL, logger=logger)
+
+REF_SEVERITY = "3+"
+
+# Checkpointed stages of run(), in order
+STAGES = [
+    "fetch",
+    "combine_4_plus",
+    "identify_peaks",
+    "overlap",
+    "match",
+    "format",
+    "upload",
+]
+
+
+def output_date() -> datetime:
+    """
+    Date that pipeline outputs are stamped with, ie. the previous day.
+    """
+    return datetime.now() - timedelta(days=1)
+
+
+def identify_peaks(df: pd.DataFrame, now: datetime) -> pd.DataFrame:
+    """
+    Find the peak hunger period of each country in the reference year.
+    """
+    logger.info("Identifying peak hunger periods...")
+    return ipc.identify_peak_hunger_period(df, now.year, REF_SEVERITY)
+
+
+def add_overlaps(df_peak: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add the overlap between each peak hunger period and the data-driven and
+    expert reference periods.
+    """
+    df_periods = stratus.load_csv_from_blob(
+        blob_name=f"{PROJECT_PREFIX}/processed/reference_periods/cleaned_reference_periods.csv"
+    ).rename(columns={"Country": "location_code"})
+    df_peak = date_utils.apply_overlap(
+        df_peak, df_periods, "data_driven_period", "data_driven_period_overlap"
+    )
+    df_peak = date_utils.apply_overlap(
+        df_peak, df_periods, "expert_period_1", "expert_period_1_overlap"
+    )
+    df_peak = date_utils.apply_overlap(
+        df_peak, df_periods, "expert_period_2", "expert_period_2_overlap"
+    )
+    return df_peak
+
+
+def match_severities(df: pd.DataFrame, df_peak: pd.DataFrame, now: datetime) -> dict:
+    """
+    Build the summary for each severity level by matching each year's data to
+    the peak hunger periods.
+
+    Returns
+    -------
+    dict
+        Maps each severity level to its summary, with countries still
+        identified by ISO3 code in the `Country` column.
+    """
+    ref_year = now.year
+    years = [ref_year, ref_year - 1, ref_year - 2]
+
+    summaries = {}
+    # Now calculate the values for each year
+    for severity in SEVERITIES:
+        df_summary = df_peak.copy()
+        df_summary["phase"] = severity
+        for year in years:
+            df_matched = ipc.match_peak_hunger_period(df, df_peak, year, severity)
+            df_summary = df_summary.merge(df_matched, how="left")
+            df_summary[f"{year}_report_period"] = df_summary[
+                f"{year}_report_period"
+            ].apply(date_utils.format_interval)
+        df_summary = ipc.add_yoy_changes(df_summary, years)
+        df_summary["reference_period"] = df_summary["reference_period"].apply(
+            date_utils.format_interval
+        )
+        summaries[severity] = format_utils.clean_columns(df_summary)
+    return summaries
+
+
+def compute_summaries(df: pd.DataFrame, now: datetime) -> dict:
+    """
+    Compute the annualized summaries for each severity level from raw HAPI data.
+
+    Every step works per country, so summaries computed for a subset of
+    countries can be spliced into those for the rest with splice_summaries().
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        IPC data as returned by ipc.get_all_ipc().
+    now : datetime.datetime
+        Date of the run, which sets the reference year.
+
+    Returns
+    -------
+    dict
+        Maps each severity level to its summary, with countries still
+        identified by ISO3 code in the `Country` column.
+    """
+    df = ipc.combine_4_plus(df)
+    df_peak = add_overlaps(identify_peaks(df, now))
+    return match_severities(df, df_peak, now)
+
+
+def splice_summaries(summaries: dict, updates: dict, iso3s: list) -> dict:
+    """
+    Replace the rows for some countries with recomputed ones.
+
+    Parameters
+    ----------
+    summaries : dict
+        Summaries for all countries, as returned by compute_summaries().
+    updates : dict
+        Summaries recomputed for `iso3s` only.
+    iso3s : list
+        Countries to replace. Countries without rows in `updates` are dropped.
+
+    Returns
+    -------
+    dict
+        Maps each severity level to its updated summary
+    """
+    spliced = {}
+    for severity, df_summary in summaries.items():
+        df_kept = df_summary[~df_summary["Country"].isin(iso3s)]
+        spliced[severity] = (
+            pd.concat([df_kept, updates[severity]], ignore_index=True)
+            .sort_values("Country")
+            .reset_index(drop=True)
+        )
+    return spliced
+
+
+def add_country_names(summaries: dict) -> dict:
+    """
+    Replace the ISO3 codes in each summary with country names.
+    """
+    return {
+        severity: format_utils.add_country_names(df_summary)
+        for severity, df_summary in summaries.items()
+    }
+
+
+def upload(summaries: dict, now: datetime) -> pd.DataFrame:
+    """
+    Upload the named summaries to blob, along with the combined summary and the
+    delta against the previous combined summary.
+
+    Parameters
+    ----------
+    summaries : dict
+        Maps each severity level to its summary, as returned by
+        add_country_names().
+    now : datetime.datetime
+        Date to stamp the outputs with.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The combined summary that was published
+    """
+    now_formatted = now.strftime("%Y-%m-%d")
+
+    df_all = []  # Collect all severity-level outputs
+    for severity, df_summary in summaries.items():
+        fname = f"annualized_ipc_summary_{severity}_{now_formatted}.csv"
+
+        # Append to combined list
+        df_all.append(df_summary.copy())
+
+        stratus.upload_csv_to_blob(
+            df_summary, f"{PROJECT_PREFIX}/processed/ipc_updates/{fname}", stage="dev"
+        )
+        logger.info(f"Output file saved successfully to blob: {fname}")
+
+    # After the loop: combine and upload all data
+    df_combined = pd.concat(df_all, ignore_index=True)
+    combined_fname = f"annualized_ipc_summary_all_{now_formatted}.csv"
+    stratus.upload_csv_to_blob(
+        df_combined,
+        f"{PROJECT_PREFIX}/processed/ipc_updates/{combined_fname}",
+        stage="dev",
+    )
+    logger.info(f"Combined output file saved successfully to blob: {combined_fname}")
+
+    # Publish what changed since the previous combined output
+    prev_date = summary.previous_date(now_formatted)
+    if prev_date is None:
+        logger.warning("No previous combined output found, skipping delta")
+    else:
+        df_prev, _ = summary.load_summary("all", prev_date)
+        df_delta = delta_utils.compute_delta(df_prev, df_combined)
+        stratus.upload_csv_to_blob(
+            df_delta, summary.delta_blob_name(now_formatted), stage="dev"
+        )
+        changelog = delta_utils.format_changelog(df_delta, now_formatted, prev_date)
+        container_client = stratus.get_container_client(stage="dev", write=True)
+        container_client.get_blob_client(
+            summary.changelog_blob_name(now_formatted)
+        ).upload_blob(
+            changelog,
+            overwrite=True,
+            content_settings=ContentSettings(content_type="text/markdown"),
+        )
+        logger.info(
+            f"Delta saved successfully to blob: {len(df_delta)} rows changed since {prev_date}"
+        )
+    return df_combined
+
+
+def publish(summaries: dict, now: datetime) -> pd.DataFrame:
+    """
+    Add country names to the summaries and upload them, see upload().
+    """
+    return upload(add_country_names(summaries), now)
+
+
+def run(now: datetime = None, from_stage: str = None, checkpoints: bool = True) -> dict:
+    """
+    Run the full pipeline for all countries.
+
+    Each stage saves a checkpoint under CHECKPOINT_DIR, so rerunning after a
+    failure on the same day resumes after the last stage that succeeded.
+
+    Parameters
+    ----------
+    now : datetime.datetime, optional
+        Date to stamp the outputs with, by default the previous day.
+    from_stage : str, optional
+        Rerun from this stage onwards, taking the results of earlier stages
+        from their most recent checkpoints. One of STAGES, and requires
+        `checkpoints`.
+    checkpoints : bool, optional
+        Whether to resume from and save checkpoints, by default True.
+
+    Returns
+    -------
+    dict
+        Summaries by severity level, as returned by compute_summaries()
+    """
+    now = now or output_date()
+    if from_stage is not None and from_stage not in STAGES:
+        raise ValueError(f"Unknown stage: {from_stage}, expected one of {STAGES}")
+    if from_stage is not None and not checkpoints:
+        raise ValueError("from_stage requires checkpoints")
+    skipped = STAGES[: STAGES.index(from_stage)] if from_stage else []
+
+    def stage(name, func, *args):
+        if not checkpoints:
+            return func(*args)
+        if name in skipped:
+            mode = "latest"
+        elif from_stage is not None:
+            mode = "run"
+        else:
+            mode = "resume"
+        return checkpoint_utils.run_stage(
+            name, func, args, salt=now.strftime("%Y-%m-%d"), mode=mode
+        )
+
+    # `now` is bound rather than passed as a stage input, as it differs on
+    # every run and would stop stages from resuming. The salt already carries
+    # the date.
+    df_raw = stage("fetch", ipc.get_all_ipc)
+    df = stage("combine_4_plus", ipc.combine_4_plus, df_raw)
+    df_peak = stage("identify_peaks", partial(identify_peaks, now=now), df)
+    df_peak = stage("overlap", add_overlaps, df_peak)
+    summaries = stage("match", partial(match_severities, now=now), df, df_peak)
+    named = stage("format", add_country_names, summaries)
+    stage("upload", partial(upload, now=now), named)
+
+    if checkpoints:
+        checkpoint_utils.prune()
+    return summaries
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import time
+import coloredlogs
+import pandas as pd
+from src.config import CHECKPOINT_DIR, CHECKPOINT_MAX_AGE_DAYS, LOG_LEVEL
+
+logger = logging.getLogger(__name__)
+coloredlogs.install(level=LOG_LEVEL, logger=logger)
+
+
+def fingerprint(obj) -> str:
+    """
+    Hash the content of a stage input or output.
+
+    DataFrames are hashed by their columns and values, so identical data
+    gives the same hash regardless of how it was produced.
+
+    Parameters
+    ----------
+    obj : object
+        DataFrame, dict or list of these, or any other picklable value.
+
+    Returns
+    -------
+    str
+        Hex digest of the content
+    """
+    digest = hashlib.sha256()
+    if isinstance(obj, pd.DataFrame):
+        digest.update(b"DataFrame")
+        digest.update(json.dumps([str(c) for c in obj.columns]).encode())
+        digest.update(json.dumps([str(t) for t in obj.dtypes]).encode())
+        digest.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+    elif isinstance(obj, dict):
+        digest.update(b"dict")
+        for key in sorted(obj, key=str):
+            digest.update(f"{key}={fingerprint(obj[key])};".encode())
+    elif isinstance(obj, (list, tuple)):
+        digest.update(type(obj).__name__.encode())
+        for item in obj:
+            digest.update(f"{fingerprint(item)};".encode())
+    else:
+        digest.update(pickle.dumps(obj))
+    return digest.hexdigest()
+
+
+def run_stage(
+    name: str,
+    func,
+    args: tuple = (),
+    salt: str = "",
+    mode: str = "resume",
+    checkpoint_dir: str = CHECKPOINT_DIR,
+):
+    """
+    Run a pipeline stage, reusing a saved result when one is available.
+
+    Results are stored under `checkpoint_dir` by the hash of their content,
+    and indexed by a key derived from the stage name, `salt` and the hashes of
+    the inputs.
+
+    Parameters
+    ----------
+    name : str
+        Name of the stage.
+    func : callable
+        Function computing the stage result from `args`.
+    args : tuple, optional
+        Inputs of the stage.
+    salt : str, optional
+        Extra value making the key unique, eg. the run date, so that stages
+        without inputs aren't reused across runs.
+    mode : str, optional
+        "resume" reuses the result for the same inputs if there is one,
+        "latest" loads the most recent result of this stage regardless of its
+        inputs, and "run" always recomputes.
+    checkpoint_dir : str, optional
+        Directory holding the checkpoints.
+
+    Returns
+    -------
+    object
+        The stage result
+    """
+    index = _load_index(checkpoint_dir)
+
+    if mode == "latest":
+        content_hash = index["latest"].get(name)
+        if content_hash is None or not os.path.exists(
+            _object_path(checkpoint_dir, content_hash)
+        ):
+            raise Exception(
+                f"No checkpoint found for stage '{name}', run the pipeline once "
+                "without --from-stage"
+            )
+        logger.info(f"Skipping stage '{name}', using latest checkpoint")
+        return _load_object(checkpoint_dir, content_hash)
+
+    key = fingerprint([name, salt, [fingerprint(arg) for arg in args]])
+    content_hash = index["keys"].get(key)
+    if (
+        mode == "resume"
+        and content_hash is not None
+        and os.path.exists(_object_path(checkpoint_dir, content_hash))
+    ):
+        logger.info(f"Resuming stage '{name}' from checkpoint")
+        return _load_object(checkpoint_dir, content_hash)
+
+    logger.info(f"Running stage '{name}'...")
+    result = func(*args)
+    content_hash = fingerprint(result)
+    path = _object_path(checkpoint_dir, content_hash)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first so a crash can't leave a partial object
+        with open(f"{path}.tmp", "wb") as f:
+            pickle.dump(result, f)
+        os.replace(f"{path}.tmp", path)
+
+    # Reload the index in case it has changed while the stage ran
+    index = _load_index(checkpoint_dir)
+    index["keys"][key] = content_hash
+    index["latest"][name] = content_hash
+    _save_index(checkpoint_dir, index)
+    return result
+
+
+def prune(
+    max_age_days: int = CHECKPOINT_MAX_AGE_DAYS, checkpoint_dir: str = CHECKPOINT_DIR
+):
+    """
+    Delete checkpoints older than `max_age_days`, keeping the latest result of
+    each stage so that --from-stage keeps working.
+    """
+    index = _load_index(checkpoint_dir)
+    objects_dir = os.path.join(checkpoint_dir, "objects")
+    if not os.path.isdir(objects_dir):
+        return
+    keep = set(index["latest"].values())
+    cutoff = time.time() - max_age_days * 24 * 60 * 60
+    for fname in os.listdir(objects_dir):
+        content_hash = fname.removesuffix(".pkl")
+        path = os.path.join(objects_dir, fname)
+        if content_hash not in keep and os.path.getmtime(path) < cutoff:
+            os.remove(path)
+    index["keys"] = {
+        key: content_hash
+        for key, content_hash in index["keys"].items()
+        if os.path.exists(_object_path(checkpoint_dir, content_hash))
+    }
+    _save_index(checkpoint_dir, index)
+
+
+def _object_path(checkpoint_dir, content_hash):
+    return os.path.join(checkpoint_dir, "objects", f"{content_hash}.pkl")
+
+
+def _load_object(checkpoint_dir, content_hash):
+    with open(_object_path(checkpoint_dir, content_hash), "rb") as f:
+        return pickle.load(f)
+
+
+def _load_index(checkpoint_dir):
+    path = os.path.join(checkpoint_dir, "index.json")
+    if not os.path.exists(path):
+        return {"keys": {}, "latest": {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _save_index(checkpoint_dir, index):
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    path = os.path.join(checkpoint_dir, "index.json")
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(index, f, indent=2)
+    os.replace(f"{path}.tmp", path)
@@ -1,6 +1,8 @@
 import pandas as pd
 from calendar import month_name
 import numpy as np
+from src.config import COMPUTE_BACKEND
+from src.utils.polars_utils import pl, require_polars
 
 
 def get_period_name(reference_interval):
@@ -27,6 +29,8 @@ def get_overlap_fraction(sx, sy):
 
 
 def apply_overlap(df, df_periods, target_period_column, output_column):
+    if COMPUTE_BACKEND == "polars":
+        return apply_overlap_polars(df, df_periods, target_period_column, output_column)
     df_summary = df.copy()
     df_summary[output_column] = 0.0
     df_summary["reference_period_months"] = df_summary["reference_period"].apply(
@@ -45,6 +49,87 @@ def apply_overlap(df, df_periods, target_period_column, output_column):
     return df_summary.drop(columns=["reference_period_months"])
 
 
+def apply_overlap_polars(df, df_periods, target_period_column, output_column):
+    """
+    Polars version of `apply_overlap()`, used in its place when
+    COMPUTE_BACKEND is "polars".
+    """
+    require_polars()
+    missing = set(df["location_code"]) - set(df_periods["location_code"])
+    if missing:
+        raise IndexError(f"No reference periods for {sorted(missing)}")
+
+    reference_period = pd.IntervalIndex(df["reference_period"])
+    lf_rows = pl.from_pandas(
+        pd.DataFrame(
+            {
+                "row": range(len(df)),
+                "location_code": df["location_code"].to_numpy(),
+                "start": reference_period.left,
+                "end": reference_period.right,
+            }
+        )
+    ).lazy()
+    # Months covered by each peak period
+    lf_months = (
+        lf_rows.with_columns(
+            pl.date_ranges(
+                pl.col("start").dt.month_start(), pl.col("end"), "1mo"
+            ).alias("month")
+        )
+        .explode("month")
+        .select("row", "location_code", pl.col("month").dt.strftime("%B"))
+        .unique()
+    )
+    # Months named in the reference period of each country, using the first
+    # row per country as the pandas version does
+    periods = df_periods[target_period_column]
+    lf_periods = pl.from_pandas(
+        pd.DataFrame(
+            {
+                "location_code": df_periods["location_code"].to_numpy(),
+                target_period_column: periods.astype(object).where(
+                    periods.notna(), None
+                ),
+            }
+        )
+    ).lazy()
+    lf_named = (
+        lf_periods.unique(subset=["location_code"], keep="first", maintain_order=True)
+        .drop_nulls(target_period_column)
+        .with_columns(pl.col(target_period_column).cast(pl.String).str.split(","))
+        .explode(target_period_column)
+        .select(
+            "location_code",
+            pl.col(target_period_column).str.strip_chars().alias("month"),
+        )
+        .unique()
+    )
+    lf_named_count = lf_named.group_by("location_code").agg(pl.len().alias("n_named"))
+    lf_covered = (
+        lf_months.join(lf_named, on=["location_code", "month"], how="inner")
+        .group_by("row")
+        .agg(pl.len().alias("n_covered"))
+    )
+    df_overlap = (
+        lf_rows.join(lf_named_count, on="location_code", how="left")
+        .join(lf_covered, on="row", how="left")
+        .select(
+            "row",
+            (pl.col("n_covered").fill_null(0) / pl.col("n_named")).alias("overlap"),
+        )
+        .sort("row")
+        .collect()
+    )
+
+    df_summary = df.copy()
+    # Countries without a reference period get NaN
+    df_summary[output_column] = (
+        df_overlap["overlap"].fill_null(float("nan")).to_numpy().astype(float)
+    )
+    return df_summary
+
+
 def get_ref_period(row):
     ref_year = row["reference_year"]
     # Account for the Jan - Dec cross
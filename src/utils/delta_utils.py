@@ -0,0 +1,123 @@
+import pandas as pd
+import numpy as np
+
+
+KEY_COLUMNS = ["Country", "Phase"]
+
+
+def _changed_mask(before, after):
+    """
+    Element-wise comparison of two aligned Series, treating missing values as
+    equal and allowing for float round-off from CSV round trips.
+    """
+    both_missing = before.isna() & after.isna()
+    if pd.api.types.is_numeric_dtype(before) and pd.api.types.is_numeric_dtype(after):
+        same = np.isclose(
+            before.astype(float), after.astype(float), rtol=0, atol=1e-9, equal_nan=True
+        )
+        return ~same
+    return ~(both_missing | (before.astype(str) == after.astype(str)))
+
+
+def compute_delta(
+    df_prev: pd.DataFrame, df_curr: pd.DataFrame, keys: list = KEY_COLUMNS
+) -> pd.DataFrame:
+    """
+    Compute a keyed diff between two combined summary outputs.
+
+    Rows are matched on `keys` and compared across the columns the two outputs
+    have in common.
+
+    Parameters
+    ----------
+    df_prev : pandas.DataFrame
+        Previously published combined summary.
+    df_curr : pandas.DataFrame
+        Newly computed combined summary.
+    keys : list, optional
+        Columns identifying a row, by default country and phase.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per added, removed or modified key, with a `Change Type`
+        column, a `Changed Columns` column listing the modified values, and
+        the current values of the row (previous values for removed rows).
+    """
+    df_prev = df_prev.astype({key: str for key in keys})
+    df_curr = df_curr.astype({key: str for key in keys})
+    shared = [c for c in df_curr.columns if c in df_prev.columns and c not in keys]
+
+    df_merged = df_prev[keys + shared].merge(
+        df_curr[keys + shared],
+        on=keys,
+        how="outer",
+        suffixes=("_prev", "_curr"),
+        indicator=True,
+    )
+
+    change_type = (
+        df_merged["_merge"]
+        .map({"left_only": "removed", "right_only": "added", "both": "modified"})
+        .astype(str)
+    )
+    df_changed = pd.DataFrame(
+        {
+            col: _changed_mask(df_merged[f"{col}_prev"], df_merged[f"{col}_curr"])
+            for col in shared
+        },
+        index=df_merged.index,
+        columns=shared,
+    )
+    # Added and removed rows differ in every column, so only list modifications
+    df_changed.loc[change_type != "modified", :] = False
+    changed_columns = pd.Series(
+        [", ".join(df_changed.columns[row]) for row in df_changed.to_numpy(bool)],
+        index=df_merged.index,
+        dtype=object,
+    )
+    is_changed = (change_type != "modified") | (changed_columns != "")
+
+    df_delta = df_merged[keys].copy()
+    df_delta["Change Type"] = change_type
+    df_delta["Changed Columns"] = changed_columns
+    for col in shared:
+        df_delta[col] = df_merged[f"{col}_curr"].where(
+            change_type != "removed", df_merged[f"{col}_prev"]
+        )
+    return df_delta[is_changed].sort_values(keys).reset_index(drop=True)
+
+
+def format_changelog(df_delta: pd.DataFrame, date: str, prev_date: str) -> str:
+    """
+    Summarise a delta as a Markdown changelog.
+
+    Parameters
+    ----------
+    df_delta : pandas.DataFrame
+        Output of compute_delta().
+    date : str
+        Date stamp of the current output.
+    prev_date : str
+        Date stamp of the output it was compared against.
+
+    Returns
+    -------
+    str
+        Markdown text listing the changes grouped by phase
+    """
+    lines = [f"# IPC summary changes {prev_date} to {date}", ""]
+    if df_delta.empty:
+        lines.append("No changes.")
+        return "\n".join(lines) + "\n"
+
+    counts = df_delta["Change Type"].value_counts()
+    lines.append(
+        ", ".join(f"{counts.get(t, 0)} {t}" for t in ["added", "modified", "removed"])
+    )
+    for phase, dff in df_delta.groupby("Phase", sort=True):
+        lines += ["", f"## Phase {phase}", ""]
+        for _, row in dff.iterrows():
+            detail = f": {row['Changed Columns']}" if row["Changed Columns"] else ""
+            lines.append(f"- {row['Country']} ({row['Change Type']}){detail}")
+    return "\n".join(lines) + "\n"
@@ -1,7 +1,11 @@
+import base64
+import gzip
+import json
 import requests
 import pandas as pd
 import os
 from dotenv import load_dotenv
+from src.config import HAPI_TIMEOUT
 
 load_dotenv()
 
@@ -64,7 +68,8 @@ def add_country_names(df):
         "output_format": "json",
     }
     # Check if the request was successful
-    response = requests.get(endpoint, params=params)
+    response = requests.get(endpoint, params=params, timeout=HAPI_TIMEOUT)
+    response.raise_for_status()
     json_data = response.json()
     # Extract the data list from the JSON
     data_list = json_data.get("data", [])
@@ -76,3 +81,20 @@ def add_country_names(df):
     last_col = df_summary.columns[-1]
     df_summary.insert(0, last_col, df_summary.pop(last_col))
     return df_summary.rename(columns={"Location": "Country"})
+
+
+def encode_columnar(df):
+    """
+    Encode a DataFrame compactly for sending to the browser: JSON with one
+    list of values per column, gzipped and base64 encoded. Missing values are
+    encoded as null. Decoded by `assets/clientside.js`.
+    """
+    table = {
+        "columns": [str(col) for col in df.columns],
+        "values": [
+            df[col].astype(object).where(df[col].notna(), None).tolist()
+            for col in df.columns
+        ],
+    }
+    payload = json.dumps(table, separators=(",", ":"), allow_nan=False).encode()
+    return base64.b64encode(gzip.compress(payload)).decode()
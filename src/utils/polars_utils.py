@@ -0,0 +1,16 @@
+# polars is optional, and only needed when COMPUTE_BACKEND is "polars"
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+
+def require_polars():
+    """
+    Raise an ImportError explaining how to install polars if it is missing.
+    """
+    if pl is None:
+        raise ImportError(
+            "The polars compute backend requires polars, install it with "
+            "`pip install polars`"
+        )
@@ -0,0 +1,178 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.datasources import ipc, ipc_polars
+from src.utils import date_utils
+
+pytest.importorskip("polars")
+
+# Analyses ending a few months ago, so that they fall within the window that
+# identify_peak_hunger_period() looks at whatever the date
+NOW = pd.Timestamp(datetime.now()).normalize()
+YEAR = (NOW - pd.DateOffset(months=2)).year
+
+
+@pytest.fixture(autouse=True)
+def pandas_backend(monkeypatch):
+    # The pandas versions are reached through the dispatching functions, so
+    # make sure they don't dispatch to polars
+    monkeypatch.setattr(ipc, "COMPUTE_BACKEND", "pandas")
+    monkeypatch.setattr(date_utils, "COMPUTE_BACKEND", "pandas")
+
+
+def months_ago(n, day=1):
+    date = NOW - pd.DateOffset(months=n)
+    return pd.Timestamp(year=date.year, month=date.month, day=day)
+
+
+def row(iso3, phase, ipc_type, fraction, start, end, number=1000):
+    return {
+        "location_code": iso3,
+        "ipc_phase": phase,
+        "ipc_type": ipc_type,
+        "population_in_phase": number,
+        "population_fraction_in_phase": fraction,
+        "From": start,
+        "To": end,
+        "year": end.year,
+    }
+
+
+def ipc_data(rows):
+    df = pd.DataFrame(rows)
+    df["year"] = df["year"].astype("int32")
+    return df
+
+
+def assert_same(expected, actual, sort_by=None):
+    if sort_by:
+        expected = expected.sort_values(sort_by)
+        actual = actual.sort_values(sort_by)
+    pd.testing.assert_frame_equal(
+        expected.reset_index(drop=True),
+        actual.reset_index(drop=True),
+        check_exact=False,
+    )
+
+
+def test_identify_peak_prefers_current_analysis_for_duplicate_periods():
+    period_a = (months_ago(8), months_ago(6, day=28))
+    period_b = (months_ago(5), months_ago(3, day=28))
+    df = ipc_data(
+        [
+            # Same period published as current and as a projection. Only the
+            # current one counts, so period B is the peak
+            row("AAA", "3+", "first_projection", 0.9, *period_a),
+            row("AAA", "3+", "current", 0.3, *period_a),
+            row("AAA", "3+", "current", 0.5, *period_b),
+            # Only projections for this period, the second projection wins
+            row("BBB", "3+", "first_projection", 0.2, *period_a),
+            row("BBB", "3+", "second_projection", 0.7, *period_a),
+            row("BBB", "3+", "current", 0.4, *period_b),
+        ]
+    )
+    expected = ipc.identify_peak_hunger_period(df, YEAR, "3+")
+    assert_same(expected, ipc_polars.identify_peak_hunger_period(df, YEAR, "3+"))
+    peak = expected.set_index("location_code")["reference_period"]
+    assert peak["AAA"].left == period_b[0]
+    assert peak["BBB"].left == period_a[0]
+
+
+def test_identify_peak_with_missing_fractions():
+    period_a = (months_ago(8), months_ago(6, day=28))
+    period_b = (months_ago(5), months_ago(3, day=28))
+    df = ipc_data(
+        [
+            row("AAA", "3+", "current", np.nan, *period_a),
+            row("AAA", "3+", "current", 0.1, *period_b),
+            # Only a missing fraction, which is still kept
+            row("BBB", "3+", "current", np.nan, *period_a),
+        ]
+    )
+    assert_same(
+        ipc.identify_peak_hunger_period(df, YEAR, "3+"),
+        ipc_polars.identify_peak_hunger_period(df, YEAR, "3+"),
+    )
+
+
+def test_match_peak_with_missing_fractions():
+    period_a = (months_ago(8), months_ago(6, day=28))
+    period_b = (months_ago(7), months_ago(5, day=28))
+    df = ipc_data(
+        [
+            row("AAA", "3+", "current", 0.4, *period_a),
+            row("AAA", "3+", "first_projection", np.nan, *period_b, number=5),
+            row("BBB", "3+", "current", np.nan, *period_a),
+        ]
+    )
+    df_peak = ipc.identify_peak_hunger_period(df, YEAR, "3+")
+    year = period_a[1].year
+    assert_same(
+        ipc.match_peak_hunger_period(df, df_peak, year, "3+"),
+        ipc_polars.match_peak_hunger_period(df, df_peak, year, "3+"),
+    )
+
+
+def test_combine_4_plus_with_missing_fractions():
+    period = (months_ago(8), months_ago(6, day=28))
+    df = ipc_data(
+        [
+            row("AAA", "4", "current", 0.2, *period),
+            row("AAA", "5", "current", np.nan, *period),
+            row("BBB", "4", "current", np.nan, *period),
+            row("BBB", "5", "current", np.nan, *period),
+            row("CCC", "3", "current", 0.5, *period),
+        ]
+    )
+    assert_same(
+        ipc.combine_4_plus(df),
+        ipc_polars.combine_4_plus(df),
+        sort_by=["location_code", "ipc_phase"],
+    )
+
+
+@pytest.mark.parametrize(
+    "period",
+    [
+        "{peak_start}, {peak_mid}, {peak_end}",
+        "{peak_start}, {other},",
+        " {peak_start} ,{peak_end}, ",
+        "{peak_mid}, {peak_mid}, {other}",
+        "{other}",
+        np.nan,
+    ],
+)
+def test_apply_overlap_reference_period_formats(period):
+    df = ipc_data(
+        [
+            row("AAA", "3+", "current", 0.4, months_ago(8), months_ago(6, day=28)),
+            row("BBB", "3+", "current", 0.4, months_ago(4), months_ago(1, day=28)),
+        ]
+    )
+    df_peak = ipc.identify_peak_hunger_period(df, YEAR, "3+")
+    if isinstance(period, str):
+        # Month names are relative to the peak period of AAA, with one that
+        # falls outside it
+        period = period.format(
+            peak_start=months_ago(8).strftime("%B"),
+            peak_mid=months_ago(7).strftime("%B"),
+            peak_end=months_ago(6).strftime("%B"),
+            other=months_ago(10).strftime("%B"),
+        )
+    df_periods = pd.DataFrame(
+        {
+            "location_code": ["AAA", "BBB"],
+            "data_driven_period": [period, months_ago(2).strftime("%B")],
+        }
+    )
+    assert_same(
+        date_utils.apply_overlap(
+            df_peak, df_periods, "data_driven_period", "data_driven_period_overlap"
+        ),
+        date_utils.apply_overlap_polars(
+            df_peak, df_periods, "data_driven_period", "data_driven_period_overlap"
+        ),
+    )